@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Store, MenuItem, Inventory
+from .models import Store, MenuItem, Inventory, Order, OrderItem, SalesHourly, SalesDaily
 
 
 @admin.register(Store)
@@ -26,3 +26,48 @@ class InventoryAdmin(admin.ModelAdmin):
         return obj.menu_item.store.name
     get_store.short_description = 'Store'
     get_store.admin_order_field = 'menu_item__store'
+
+
+class ReadOnlyAdminMixin:
+    """Orders and rollups are written by the API; edits here would drift from the rollups."""
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class OrderItemInline(ReadOnlyAdminMixin, admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    fields = ['store', 'menu_item', 'quantity', 'price', 'created_at']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('store', 'menu_item')
+
+
+@admin.register(Order)
+class OrderAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ['id', 'created_at']
+    list_filter = ['created_at']
+    inlines = [OrderItemInline]
+
+
+@admin.register(SalesHourly)
+class SalesHourlyAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ['id', 'menu_item', 'store', 'hour', 'units', 'revenue']
+    list_filter = ['store', 'hour']
+    list_select_related = ['menu_item', 'store']
+    search_fields = ['menu_item__name']
+
+
+@admin.register(SalesDaily)
+class SalesDailyAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ['id', 'menu_item', 'store', 'date', 'units', 'revenue']
+    list_filter = ['store', 'date']
+    list_select_related = ['menu_item', 'store']
+    search_fields = ['menu_item__name']
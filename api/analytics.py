@@ -0,0 +1,113 @@
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, F, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import Inventory, OrderItem, SalesHourly, SalesDaily
+
+VELOCITY_WINDOW_HOURS = 24
+MAX_VELOCITY_WINDOW_HOURS = 24 * 7
+DAILY_SERIES_DAYS = 30
+MAX_DAILY_SERIES_DAYS = 366
+
+
+def _revenue():
+    return Sum(F('quantity') * F('price'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def hour_bucket(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _increment(model, bucket_field, bucket, store_id, menu_item_id, units, revenue):
+    lookup = {'menu_item_id': menu_item_id, bucket_field: bucket}
+    increments = {'units': F('units') + units, 'revenue': F('revenue') + revenue}
+    if model.objects.filter(**lookup).update(**increments):
+        return
+    try:
+        # Savepoint so a concurrent insert of the same bucket doesn't poison the outer transaction
+        with transaction.atomic():
+            model.objects.create(store_id=store_id, units=units, revenue=revenue, **lookup)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**increments)
+
+
+def record_sales(order_items):
+    """Fold freshly placed order items into the hourly and daily rollups."""
+    totals = defaultdict(lambda: [0, 0])
+    for order_item in order_items:
+        key = (order_item.store_id, order_item.menu_item_id, hour_bucket(order_item.created_at))
+        totals[key][0] += order_item.quantity
+        totals[key][1] += order_item.quantity * order_item.price
+
+    for (store_id, menu_item_id, hour), (units, revenue) in totals.items():
+        _increment(SalesHourly, 'hour', hour, store_id, menu_item_id, units, revenue)
+        _increment(SalesDaily, 'date', hour.date(), store_id, menu_item_id, units, revenue)
+
+
+def _lock_out_order_writers():
+    """
+    Block order placement until the current transaction ends.
+
+    PlaceOrderView locks the Inventory rows it deducts before calling
+    record_sales, so holding every Inventory row keeps new sales (and their
+    rollup increments) out while a rebuild reads and rewrites the rollups.
+    Rows are locked in the view's (store, item) order so the two can't deadlock.
+    """
+    list(
+        Inventory.objects.select_for_update(of=('self',))
+        .order_by('menu_item__store_id', 'menu_item_id')
+        .values_list('id', flat=True)
+    )
+
+
+def rebuild_rollups(start, end):
+    """
+    Recompute the rollups for order items created in [start, end).
+
+    Both bounds must fall on day boundaries so no hourly or daily bucket is
+    split across two rebuild chunks. Returns the number of rows written.
+    """
+    with transaction.atomic():
+        # Live orders only ever increment the current hour, so only a chunk
+        # reaching into it has to hold off order placement
+        if end > hour_bucket(timezone.now()):
+            _lock_out_order_writers()
+
+        order_items = OrderItem.objects.filter(created_at__gte=start, created_at__lt=end)
+        hourly = [
+            SalesHourly(store_id=row['store_id'], menu_item_id=row['menu_item_id'], hour=row['bucket'],
+                        units=row['units'], revenue=row['revenue'])
+            for row in order_items.annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .values('store_id', 'menu_item_id', 'bucket')
+            .annotate(units=Sum('quantity'), revenue=_revenue())
+            .order_by()
+        ]
+        daily = [
+            SalesDaily(store_id=row['store_id'], menu_item_id=row['menu_item_id'], date=row['bucket'],
+                       units=row['units'], revenue=row['revenue'])
+            for row in order_items.annotate(bucket=TruncDate('created_at', tzinfo=dt_timezone.utc))
+            .values('store_id', 'menu_item_id', 'bucket')
+            .annotate(units=Sum('quantity'), revenue=_revenue())
+            .order_by()
+        ]
+
+        SalesHourly.objects.filter(hour__gte=start, hour__lt=end).delete()
+        SalesDaily.objects.filter(date__gte=start.date(), date__lt=end.date()).delete()
+        SalesHourly.objects.bulk_create(hourly, batch_size=1000)
+        SalesDaily.objects.bulk_create(daily, batch_size=1000)
+
+    return len(hourly) + len(daily)
+
+
+def day_chunks(start, end, chunk_days):
+    """Yield consecutive [chunk_start, chunk_end) ranges covering [start, end)."""
+    step = timedelta(days=chunk_days)
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + step, end)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
@@ -0,0 +1,109 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so every measurement is a true cold start
+BOOT_SCRIPT = r'''
+import json, sys, time
+t0 = time.perf_counter()
+from config.wsgi import application
+t1 = time.perf_counter()
+path = sys.argv[1]
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer,
+    'wsgi.errors': sys.stderr, 'wsgi.multithread': False, 'wsgi.multiprocess': True,
+    'wsgi.run_once': False, 'wsgi.version': (1, 0),
+}
+status = []
+response = application(environ, lambda s, headers, exc_info=None: status.append(s))
+b''.join(response)
+t2 = time.perf_counter()
+print(json.dumps({'boot_ms': (t1 - t0) * 1000, 'first_request_ms': (t2 - t1) * 1000, 'status': status[0]}))
+'''
+
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us)} from `python -X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Profiles cold-start import time and first-request latency of the WSGI application'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-module', action='append', dest='settings_modules',
+                            help='Settings module to profile; repeat to compare (default: current settings)')
+        parser.add_argument('--path', default='/stores/1/menu/',
+                            help='Path of the first request (default: /stores/1/menu/)')
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Cold starts per settings module; medians are reported (default: 5)')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Number of modules with the highest self import time to list (default: 15)')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        settings_modules = options['settings_modules'] or [os.environ['DJANGO_SETTINGS_MODULE']]
+
+        summaries = []
+        for settings_module in settings_modules:
+            summaries.append(self.profile(settings_module, options))
+
+        if len(summaries) > 1:
+            self.stdout.write('\n=== Comparison (medians) ===')
+            for settings_module, boot_ms, first_ms in summaries:
+                self.stdout.write(f'{settings_module:<30} boot {boot_ms:8.1f} ms | first request {first_ms:8.1f} ms '
+                                  f'| total {boot_ms + first_ms:8.1f} ms')
+
+    def profile(self, settings_module, options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+        timings = []
+        modules = {}
+        for _ in range(options['runs']):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, options['path']],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL,
+            )
+            if result.returncode != 0:
+                raise CommandError(f'{settings_module} failed to start:\n{result.stderr[-2000:]}')
+            timing = json.loads(result.stdout.strip().splitlines()[-1])
+            if not timing['status'].startswith(('2', '3')):
+                raise CommandError(
+                    f'{settings_module}: first request to {options["path"]} returned {timing["status"]}, '
+                    'so the timings would measure an error page. Run migrate and seed_data, or pass --path.'
+                )
+            timings.append(timing)
+            # Keep the last run's breakdown; earlier runs warm the filesystem cache
+            modules = parse_importtime(result.stderr)
+
+        boot_ms = statistics.median(t['boot_ms'] for t in timings)
+        first_ms = statistics.median(t['first_request_ms'] for t in timings)
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== {settings_module} ({options["runs"]} cold starts) ==='))
+        self.stdout.write(f'Boot (import + setup):  {boot_ms:8.1f} ms')
+        self.stdout.write(f'First request {options["path"]}: {first_ms:8.1f} ms ({timings[-1]["status"]})')
+        self.stdout.write(f'Modules imported: {len(modules)}')
+        # Sort by self time: cumulative time just lists the parents of the import chain (config.wsgi, django.urls, ...)
+        self.stdout.write(f'\nSlowest {options["top"]} modules by self import time:')
+        self.stdout.write(f'{"self ms":>9} {"cumulative ms":>14}  module')
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:options['top']]
+        for name, (self_us, cumulative_us) in slowest:
+            self.stdout.write(f'{self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}  {name}')
+
+        return settings_module, boot_ms, first_ms
@@ -0,0 +1,44 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.analytics import rebuild_rollups, day_chunks
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the hourly and daily sales rollups from order items, one chunk of days at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365,
+                            help='Number of days to rebuild, ending today (default: 365)')
+        parser.add_argument('--since', help='Rebuild from this date (YYYY-MM-DD) instead of using --days')
+        parser.add_argument('--chunk-days', type=int, default=7,
+                            help='Days of order items aggregated per transaction (default: 7)')
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days must be at least 1')
+
+        today = timezone.now().date()
+        if options['since']:
+            try:
+                start_date = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        else:
+            if options['days'] < 1:
+                raise CommandError('--days must be at least 1')
+            start_date = today - timedelta(days=options['days'] - 1)
+
+        # Rollup buckets are UTC, so chunk on UTC midnights
+        start = datetime.combine(start_date, time.min, tzinfo=dt_timezone.utc)
+        end = datetime.combine(today + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+
+        total = 0
+        for chunk_start, chunk_end in day_chunks(start, end, options['chunk_days']):
+            written = rebuild_rollups(chunk_start, chunk_end)
+            total += written
+            self.stdout.write(f'{chunk_start:%Y-%m-%d} .. {chunk_end:%Y-%m-%d}: {written} rollup rows')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} rollup rows from {start_date} to {today}'))
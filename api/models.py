@@ -36,3 +36,58 @@ class Inventory(models.Model):
 
     def __str__(self):
         return f"Inventory for {self.menu_item.name}"
+
+class Order(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Order #{self.id}"
+
+class OrderItem(models.Model):
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='order_items')
+    menu_item = models.ForeignKey(MenuItem, on_delete=models.CASCADE, related_name='order_items')
+    quantity = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.menu_item.name}"
+
+class SalesHourly(models.Model):
+    """Per-item units and revenue sold within one clock hour (UTC)."""
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='sales_hourly')
+    menu_item = models.ForeignKey(MenuItem, on_delete=models.CASCADE, related_name='sales_hourly')
+    hour = models.DateTimeField()
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['menu_item', 'hour'], name='unique_sales_hourly_item_hour'),
+        ]
+        indexes = [
+            models.Index(fields=['store', 'hour'], name='sales_hourly_store_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.menu_item.name} @ {self.hour:%Y-%m-%d %H:00}: {self.units}"
+
+class SalesDaily(models.Model):
+    """Per-item units and revenue sold within one calendar day (UTC)."""
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='sales_daily')
+    menu_item = models.ForeignKey(MenuItem, on_delete=models.CASCADE, related_name='sales_daily')
+    date = models.DateField()
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['menu_item', 'date'], name='unique_sales_daily_item_date'),
+        ]
+        indexes = [
+            models.Index(fields=['store', 'date'], name='sales_daily_store_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.menu_item.name} on {self.date}: {self.units}"
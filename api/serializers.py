@@ -41,5 +41,38 @@ class OrderItemSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1)
 
 class PlaceOrderSerializer(serializers.Serializer):
+    # Optional: when given, every item must belong to this store. Omit it to check out across stores.
+    store_id = serializers.IntegerField(required=False)
+    items = OrderItemSerializer(many=True, allow_empty=False)
+
+class OrderLineSerializer(serializers.Serializer):
+    menu_item_id = serializers.IntegerField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    line_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+class StoreOrderSerializer(serializers.Serializer):
     store_id = serializers.IntegerField()
-    items = OrderItemSerializer(many=True)
\ No newline at end of file
+    store_name = serializers.CharField()
+    items = OrderLineSerializer(many=True)
+    subtotal = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+class OrderSummarySerializer(serializers.Serializer):
+    order_id = serializers.IntegerField()
+    stores = StoreOrderSerializer(many=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+class ItemSalesVelocitySerializer(serializers.Serializer):
+    menu_item_id = serializers.IntegerField()
+    name = serializers.CharField()
+    units_sold = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units_per_hour = serializers.FloatField()
+    quantity = serializers.IntegerField()
+    sell_out_eta_hours = serializers.FloatField(allow_null=True)
+
+class DailySalesSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -1,8 +1,19 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Store, MenuItem, Inventory
+from .models import Store, MenuItem, Inventory, OrderItem, SalesHourly, SalesDaily
 
 class MenuAPITestCase(APITestCase):
     def setUp(self):
@@ -162,3 +173,237 @@ class OrderAPITestCase(APITestCase):
         self.inventory2.refresh_from_db()
         self.assertEqual(self.inventory1.quantity, 10)  # Unchanged
         self.assertEqual(self.inventory2.quantity, 5)  # Unchanged
+
+class MultiStoreOrderAPITestCase(APITestCase):
+    def setUp(self):
+        self.stores = [Store.objects.create(name=f"Store {i}") for i in range(3)]
+        self.menu_items = []
+        self.inventories = []
+        for store in self.stores:
+            menu_item = MenuItem.objects.create(store=store, name=f"{store.name} Item", price=10.00, is_active=True)
+            self.menu_items.append(menu_item)
+            self.inventories.append(Inventory.objects.create(menu_item=menu_item, quantity=10))
+
+    def test_order_across_stores_returns_breakdown(self):
+        """Test: Order without store_id spans stores and returns a per-store breakdown"""
+        url = reverse('place-order')
+        data = {
+            'items': [
+                {'menu_item_id': self.menu_items[2].id, 'quantity': 1},
+                {'menu_item_id': self.menu_items[0].id, 'quantity': 2},
+                {'menu_item_id': self.menu_items[0].id, 'quantity': 1},
+            ]
+        }
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([store['store_id'] for store in response.data['stores']],
+                         [self.stores[0].id, self.stores[2].id])
+        self.assertEqual(response.data['stores'][0]['items'][0]['quantity'], 3)
+        self.assertEqual(response.data['stores'][0]['subtotal'], '30.00')
+        self.assertEqual(response.data['total'], '40.00')
+        self.inventories[0].refresh_from_db()
+        self.assertEqual(self.inventories[0].quantity, 7)
+
+    def test_item_from_other_store_with_store_id_returns_404(self):
+        """Test: Order with store_id rejects menu items that belong to a different store"""
+        url = reverse('place-order')
+        data = {
+            'store_id': self.stores[0].id,
+            'items': [{'menu_item_id': self.menu_items[1].id, 'quantity': 1}]
+        }
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_one_store_failing_rolls_back_all_stores(self):
+        """Test: Insufficient inventory at one store leaves every store's inventory unchanged"""
+        url = reverse('place-order')
+        data = {
+            'items': [
+                {'menu_item_id': self.menu_items[0].id, 'quantity': 1},
+                {'menu_item_id': self.menu_items[1].id, 'quantity': 11},
+            ]
+        }
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for inventory in self.inventories:
+            inventory.refresh_from_db()
+            self.assertEqual(inventory.quantity, 10)
+
+    def test_inventory_removed_before_lock_returns_400(self):
+        """Test: Order fails instead of silently dropping an item whose inventory vanished before locking"""
+        url = reverse('place-order')
+        data = {
+            'items': [
+                {'menu_item_id': self.menu_items[0].id, 'quantity': 1},
+                {'menu_item_id': self.menu_items[1].id, 'quantity': 1},
+            ]
+        }
+        original_atomic = transaction.atomic
+        deleted = []
+
+        def delete_then_atomic(*args, **kwargs):
+            # Remove the inventory once, right after validation and before the view takes its locks
+            if not deleted:
+                deleted.append(True)
+                Inventory.objects.filter(menu_item=self.menu_items[1]).delete()
+            return original_atomic(*args, **kwargs)
+
+        with mock.patch('api.views.transaction.atomic', side_effect=delete_then_atomic):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.inventories[0].refresh_from_db()
+        self.assertEqual(self.inventories[0].quantity, 10)
+        self.assertFalse(OrderItem.objects.exists())
+
+    def test_query_count_flat_across_stores(self):
+        """Test: Checkout issues the same number of queries for one store or three"""
+        url = reverse('place-order')
+        extra_items = [
+            MenuItem.objects.create(store=self.stores[0], name=f"Extra {i}", price=5.00, is_active=True)
+            for i in range(3)
+        ]
+        for menu_item in extra_items:
+            Inventory.objects.create(menu_item=menu_item, quantity=10)
+
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.post(url, {'items': [{'menu_item_id': m.id, 'quantity': 1} for m in extra_items]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as multi:
+            response = self.client.post(url, {'items': [{'menu_item_id': m.id, 'quantity': 1} for m in self.menu_items]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(single.captured_queries), len(multi.captured_queries))
+
+class SalesAnalyticsTestCase(APITestCase):
+    def setUp(self):
+        self.store = Store.objects.create(name="Test Store")
+        self.menu_item1 = MenuItem.objects.create(
+            store=self.store, name="Item 1", price=10.00, is_active=True
+        )
+        self.menu_item2 = MenuItem.objects.create(
+            store=self.store, name="Item 2", price=5.00, is_active=True
+        )
+        Inventory.objects.create(menu_item=self.menu_item1, quantity=50)
+        Inventory.objects.create(menu_item=self.menu_item2, quantity=5)
+
+    def place_order(self, items):
+        data = {
+            'store_id': self.store.id,
+            'items': [{'menu_item_id': item.id, 'quantity': quantity} for item, quantity in items]
+        }
+        response = self.client.post(reverse('place-order'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def test_order_updates_rollups_incrementally(self):
+        """Test: Placing orders folds units and revenue into the hourly and daily rollups"""
+        self.place_order([(self.menu_item1, 2)])
+        self.place_order([(self.menu_item1, 3)])
+        hourly = SalesHourly.objects.get(menu_item=self.menu_item1)
+        daily = SalesDaily.objects.get(menu_item=self.menu_item1)
+        self.assertEqual(hourly.units, 5)
+        self.assertEqual(daily.units, 5)
+        self.assertEqual(daily.revenue, Decimal('50.00'))
+
+    def test_velocity_and_sell_out_eta(self):
+        """Test: Analytics API reports units per hour and sell-out ETA from the rollups"""
+        self.place_order([(self.menu_item1, 24)])
+        url = reverse('store-analytics', kwargs={'store_id': self.store.id})
+        with self.assertNumQueries(2):  # One rollup aggregate, one menu + inventory query
+            response = self.client.get(url, {'hours': 24})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = {item['menu_item_id']: item for item in response.data['items']}
+        self.assertEqual(items[self.menu_item1.id]['units_sold'], 24)
+        self.assertEqual(items[self.menu_item1.id]['units_per_hour'], 1.0)
+        self.assertEqual(items[self.menu_item1.id]['sell_out_eta_hours'], 26.0)
+        self.assertIsNone(items[self.menu_item2.id]['sell_out_eta_hours'])
+
+    def test_invalid_window_returns_400(self):
+        """Test: Analytics API rejects out-of-range windows with 400 Bad Request"""
+        url = reverse('store-analytics', kwargs={'store_id': self.store.id})
+        self.assertEqual(self.client.get(url, {'hours': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+        url = reverse('store-analytics-daily', kwargs={'store_id': self.store.id})
+        self.assertEqual(self.client.get(url, {'days': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_rebuilds_rollups(self):
+        """Test: rebuild_sales_rollups recreates rollups that match the order history"""
+        self.place_order([(self.menu_item1, 2), (self.menu_item2, 1)])
+        self.place_order([(self.menu_item2, 3)])
+        SalesHourly.objects.update(units=0)
+        SalesDaily.objects.all().delete()
+        call_command('rebuild_sales_rollups', days=2, chunk_days=1, stdout=StringIO())
+        self.assertEqual(SalesHourly.objects.get(menu_item=self.menu_item2).units, 4)
+        url = reverse('store-analytics-daily', kwargs={'store_id': self.store.id})
+        response = self.client.get(url, {'days': 7})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['series']), 1)
+        self.assertEqual(response.data['series'][0]['units'], 6)
+        self.assertEqual(response.data['series'][0]['revenue'], '40.00')
+
+    def test_order_before_rebuild_aggregation_is_counted_once(self):
+        """Test: An order placed after the rebuild's lock but before its aggregate read is counted exactly once"""
+        from . import analytics
+        lock_out_order_writers = analytics._lock_out_order_writers
+
+        def lock_then_order():
+            lock_out_order_writers()
+            self.place_order([(self.menu_item1, 4)])
+
+        self.place_order([(self.menu_item1, 2)])
+        with mock.patch.object(analytics, '_lock_out_order_writers', side_effect=lock_then_order):
+            call_command('rebuild_sales_rollups', days=1, stdout=StringIO())
+        self.place_order([(self.menu_item1, 1)])
+        self.assertEqual(SalesHourly.objects.get(menu_item=self.menu_item1).units, 7)
+        self.assertEqual(SalesDaily.objects.get(menu_item=self.menu_item1).units, 7)
+
+    def test_rebuild_locks_out_orders_only_for_current_chunk(self):
+        """Test: Rebuilding closed chunks doesn't block checkout; the chunk reaching the current hour does"""
+        from . import analytics
+        with mock.patch.object(analytics, '_lock_out_order_writers') as lock:
+            call_command('rebuild_sales_rollups', days=21, chunk_days=7, stdout=StringIO())
+        self.assertEqual(lock.call_count, 1)
+
+    @override_settings(TIME_ZONE='Asia/Kolkata')
+    def test_rebuild_buckets_in_utc(self):
+        """Test: Rebuilt rollups use the same UTC buckets as live order recording"""
+        self.place_order([(self.menu_item1, 2)])
+        live = list(SalesHourly.objects.values_list('hour', 'units')) + list(SalesDaily.objects.values_list('date', 'units'))
+        call_command('rebuild_sales_rollups', days=2, stdout=StringIO())
+        rebuilt = list(SalesHourly.objects.values_list('hour', 'units')) + list(SalesDaily.objects.values_list('date', 'units'))
+        self.assertEqual(live, rebuilt)
+
+class ProfileStartupTestCase(TestCase):
+    def test_parse_importtime(self):
+        """Test: profile_startup parses self and cumulative times from -X importtime output"""
+        from .management.commands.profile_startup import parse_importtime
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     _io\n"
+            "import time:      1500 |       4200 |   django.urls\n"
+            "some unrelated warning\n"
+        )
+        modules = parse_importtime(stderr)
+        self.assertEqual(modules, {'_io': (120, 120), 'django.urls': (1500, 4200)})
+
+    def test_slim_profile_boots_and_serves_request(self):
+        """Test: config.wsgi cold-starts under config.settings_api and serves an API request"""
+        from .management.commands.profile_startup import BOOT_SCRIPT
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings_api'}
+        # GET on the order endpoint reaches the DRF view without touching the database
+        result = subprocess.run(
+            [sys.executable, '-c', 'import config.asgi\n' + BOOT_SCRIPT, '/orders/'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout.splitlines()[-1])['status'], '405 Method Not Allowed')
+
+    def test_slim_urlconf_and_middleware_serve_menu(self):
+        """Test: Menu API works through the slim profile's URLconf, middleware and JSON-only DRF settings"""
+        from config import settings_api
+        store = Store.objects.create(name="Test Store")
+        MenuItem.objects.create(store=store, name="Item", price=10.00, is_active=True)
+        with override_settings(ROOT_URLCONF=settings_api.ROOT_URLCONF, MIDDLEWARE=settings_api.MIDDLEWARE,
+                               REST_FRAMEWORK=settings_api.REST_FRAMEWORK):
+            response = self.client.get(reverse('store-menu', kwargs={'store_id': store.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.json()), 1)
@@ -3,6 +3,8 @@ from . import views
 
 urlpatterns = [
     path('stores/<int:store_id>/menu/', views.StoreMenuView.as_view(), name='store-menu'),
+    path('stores/<int:store_id>/analytics/', views.StoreSalesAnalyticsView.as_view(), name='store-analytics'),
+    path('stores/<int:store_id>/analytics/daily/', views.StoreDailySalesView.as_view(), name='store-analytics-daily'),
     path('inventory/<int:menu_item_id>/', views.InventoryUpdateView.as_view(), name='inventory-update'),
     path('orders/', views.PlaceOrderView.as_view(), name='place-order'),
 ]
\ No newline at end of file
@@ -1,10 +1,21 @@
+from datetime import timedelta
+from itertools import groupby
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Store, MenuItem, Inventory
-from .serializers import MenuItemSerializer, InventorySerializer, PlaceOrderSerializer
+from .analytics import (
+    record_sales, hour_bucket,
+    VELOCITY_WINDOW_HOURS, MAX_VELOCITY_WINDOW_HOURS, DAILY_SERIES_DAYS, MAX_DAILY_SERIES_DAYS,
+)
+from .models import Store, MenuItem, Inventory, Order, OrderItem, SalesHourly, SalesDaily
+from .serializers import (
+    MenuItemSerializer, InventorySerializer, PlaceOrderSerializer,
+    OrderSummarySerializer, ItemSalesVelocitySerializer, DailySalesSerializer,
+)
 
 class StoreMenuView(generics.ListAPIView):
     serializer_class = MenuItemSerializer
@@ -34,35 +45,177 @@ class PlaceOrderView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        store_id = serializer.validated_data['store_id']
+        store_id = serializer.validated_data.get('store_id')
         items = serializer.validated_data['items']
         
-        store = get_object_or_404(Store, id=store_id)
+        if store_id is not None:
+            get_object_or_404(Store, id=store_id)
         
-        # Validate all items first
+        # Merge repeated lines for the same menu item
+        quantities = {}
         for item in items:
-            menu_item_id = item['menu_item_id']
-            order_quantity = item['quantity']
-            
-            menu_item = get_object_or_404(MenuItem, id=menu_item_id, store=store)
+            quantities[item['menu_item_id']] = quantities.get(item['menu_item_id'], 0) + item['quantity']
+        
+        # Validate all items first, across every store, with one grouped query
+        menu_items = MenuItem.objects.filter(id__in=quantities).select_related('store', 'inventory')
+        if store_id is not None:
+            menu_items = menu_items.filter(store_id=store_id)
+        menu_items = {menu_item.id: menu_item for menu_item in menu_items}
+        
+        for menu_item_id, order_quantity in quantities.items():
+            menu_item = menu_items.get(menu_item_id)
+            if menu_item is None:
+                return Response({'error': f'Menu item {menu_item_id} not found'}, status=status.HTTP_404_NOT_FOUND)
             
             if not menu_item.is_active:
                 return Response({'error': f'Menu item {menu_item.name} is inactive'}, status=status.HTTP_400_BAD_REQUEST)
             
-            inventory = Inventory.objects.filter(menu_item=menu_item).first()
-            if not inventory or inventory.quantity < order_quantity:
+            quantity = menu_item.inventory.quantity if hasattr(menu_item, 'inventory') else 0
+            if quantity < order_quantity:
                 return Response({'error': f'Insufficient quantity for {menu_item.name}'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # All valid, now deduct
+        # All valid, now lock and deduct
         with transaction.atomic():
-            for item in items:
-                menu_item_id = item['menu_item_id']
-                order_quantity = item['quantity']
-                
-                menu_item = MenuItem.objects.get(id=menu_item_id, store=store)
-                inventory = Inventory.objects.get(menu_item=menu_item)
-                
-                inventory.quantity -= order_quantity
-                inventory.save()
+            # Lock store by store, item by item, so overlapping multi-store orders can't deadlock
+            inventories = list(
+                Inventory.objects.select_for_update(of=('self',))
+                .select_related('menu_item')
+                .filter(menu_item_id__in=quantities)
+                .order_by('menu_item__store_id', 'menu_item_id')
+            )
+            # Stock may have moved between validation and locking; nothing has been written yet.
+            # Only Inventory rows are locked, so is_active is re-read here but not held.
+            locked_ids = {inventory.menu_item_id for inventory in inventories}
+            for menu_item_id in quantities:
+                if menu_item_id not in locked_ids:
+                    menu_item = menu_items[menu_item_id]
+                    return Response({'error': f'Insufficient quantity for {menu_item.name}'}, status=status.HTTP_400_BAD_REQUEST)
+            now = timezone.now()
+            for inventory in inventories:
+                menu_item = inventory.menu_item
+                if not menu_item.is_active:
+                    return Response({'error': f'Menu item {menu_item.name} is inactive'}, status=status.HTTP_400_BAD_REQUEST)
+                inventory.quantity -= quantities[inventory.menu_item_id]
+                inventory.updated_at = now
+                if inventory.quantity < 0:
+                    return Response({'error': f'Insufficient quantity for {menu_item.name}'}, status=status.HTTP_400_BAD_REQUEST)
+            Inventory.objects.bulk_update(inventories, ['quantity', 'updated_at'])
+            
+            order = Order.objects.create()
+            order_items = [
+                OrderItem(
+                    order=order, store_id=menu_items[inventory.menu_item_id].store_id,
+                    menu_item=menu_items[inventory.menu_item_id], quantity=quantities[inventory.menu_item_id],
+                    price=menu_items[inventory.menu_item_id].price, created_at=order.created_at,
+                )
+                for inventory in inventories
+            ]
+            OrderItem.objects.bulk_create(order_items)
+            record_sales(order_items)
         
-        return Response({'message': 'Order placed successfully'}, status=status.HTTP_201_CREATED)
+        summary = {'order_id': order.id, 'stores': _store_breakdown(order_items)}
+        summary['total'] = sum(store['subtotal'] for store in summary['stores'])
+        return Response(
+            {'message': 'Order placed successfully', **OrderSummarySerializer(summary).data},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+def _store_breakdown(order_items):
+    """Group order items (already in store order) into per-store lines and subtotals."""
+    breakdown = []
+    for store_id, store_items in groupby(order_items, key=lambda order_item: order_item.store_id):
+        store_items = list(store_items)
+        lines = [
+            {
+                'menu_item_id': order_item.menu_item_id,
+                'name': order_item.menu_item.name,
+                'quantity': order_item.quantity,
+                'price': order_item.price,
+                'line_total': order_item.quantity * order_item.price,
+            }
+            for order_item in store_items
+        ]
+        breakdown.append({
+            'store_id': store_id,
+            'store_name': store_items[0].menu_item.store.name,
+            'items': lines,
+            'subtotal': sum(line['line_total'] for line in lines),
+        })
+    return breakdown
+
+
+def _positive_int_param(request, name, default, maximum):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        return None
+    return value if 1 <= value <= maximum else None
+
+class StoreSalesAnalyticsView(APIView):
+    """Per-item sales velocity and sell-out ETA, read from the hourly rollups."""
+
+    def get(self, request, store_id):
+        hours = _positive_int_param(request, 'hours', VELOCITY_WINDOW_HOURS, MAX_VELOCITY_WINDOW_HOURS)
+        if hours is None:
+            return Response({'error': f'hours must be between 1 and {MAX_VELOCITY_WINDOW_HOURS}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # The window covers the current (partial) hour plus the previous hours - 1 buckets
+        since = hour_bucket(timezone.now()) - timedelta(hours=hours - 1)
+        sales = {
+            row['menu_item_id']: row
+            for row in SalesHourly.objects.filter(store_id=store_id, hour__gte=since)
+            .values('menu_item_id')
+            .annotate(units=Sum('units'), revenue=Sum('revenue'))
+            .order_by()
+        }
+
+        results = []
+        for menu_item in MenuItem.objects.filter(store_id=store_id).select_related('inventory'):
+            row = sales.get(menu_item.id, {})
+            units = row.get('units', 0)
+            quantity = menu_item.inventory.quantity if hasattr(menu_item, 'inventory') else 0
+            units_per_hour = units / hours
+            results.append({
+                'menu_item_id': menu_item.id,
+                'name': menu_item.name,
+                'units_sold': units,
+                'revenue': row.get('revenue', 0),
+                'units_per_hour': round(units_per_hour, 3),
+                'quantity': quantity,
+                'sell_out_eta_hours': round(quantity / units_per_hour, 1) if units_per_hour else None,
+            })
+
+        return Response({
+            'store_id': store_id,
+            'window_hours': hours,
+            'items': ItemSalesVelocitySerializer(results, many=True).data,
+        })
+
+class StoreDailySalesView(APIView):
+    """Daily units and revenue for a store, read from the daily rollups."""
+
+    def get(self, request, store_id):
+        days = _positive_int_param(request, 'days', DAILY_SERIES_DAYS, MAX_DAILY_SERIES_DAYS)
+        if days is None:
+            return Response({'error': f'days must be between 1 and {MAX_DAILY_SERIES_DAYS}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        since = timezone.now().date() - timedelta(days=days - 1)
+        rollups = SalesDaily.objects.filter(store_id=store_id, date__gte=since)
+        menu_item_id = request.query_params.get('menu_item_id')
+        if menu_item_id is not None:
+            if not menu_item_id.isdigit():
+                return Response({'error': 'menu_item_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            rollups = rollups.filter(menu_item_id=menu_item_id)
+
+        series = rollups.values('date').annotate(units=Sum('units'), revenue=Sum('revenue')).order_by('date')
+        return Response({
+            'store_id': store_id,
+            'days': days,
+            'series': DailySalesSerializer(series, many=True).data,
+        })
@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Reading reverse_dict imports the URLconf and views and compiles the URL patterns
+# at boot, so the first request on a freshly scaled-out worker doesn't pay for it
+get_resolver().reverse_dict
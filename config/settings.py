@@ -13,7 +13,6 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-import dj_database_url
 
 load_dotenv()
 
@@ -82,7 +81,10 @@ WSGI_APPLICATION = "config.wsgi.application"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 # Use PostgreSQL on server (when DIRECT_URL is set via .env), SQLite locally
-if os.getenv("DIRECT_URL") and dj_database_url:
+if os.getenv("DIRECT_URL"):
+    # Imported here so SQLite-only processes don't pay for it at startup
+    import dj_database_url
+
     DATABASES = {
         'default': dj_database_url.parse(os.getenv("DIRECT_URL"))
     }
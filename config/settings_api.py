@@ -0,0 +1,34 @@
+"""
+Slim API-only settings for autoscaled workers.
+
+Builds on config.settings but drops the admin, sessions, messages and
+static files apps and their middleware, and serves JSON only. Select it with
+DJANGO_SETTINGS_MODULE=config.settings_api; use config.settings wherever the
+admin is needed.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "rest_framework",
+    "api",
+]
+
+# DRF's APIView is already CSRF-exempt and there is no session or user to protect
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "config.urls_api"
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_PERMISSION_CLASSES": [],
+    "UNAUTHENTICATED_USER": None,
+}